@@ -1,8 +1,19 @@
-from pandas import DataFrame
+from collections.abc import Iterable
+from functools import lru_cache
+from io import StringIO
+
 import numpy as np
-import tatsu as ts
 import re
-from copy import deepcopy
+import tatsu as ts
+
+
+# Labels are checked for whitespace with a translation table: a single C-level
+# pass per label, with no regex engine involved.
+_WS_TABLE = str.maketrans('', '', ' \t\n\r\v\f')
+
+# Compiling a TatSu grammar can dwarf the actual parse, so compiled grammars are
+# shared between PEGSpecifiedParser instances that use the same grammar string.
+_compile_grammar = lru_cache(maxsize=32)(ts.compile)
 
 
 class _GenotypeMatrixParser:
@@ -14,10 +25,34 @@ class _GenotypeMatrixParser:
         self.value_map = value_map
         self.transpose = transpose
 
+        # When all the keys are integers (as in the predefined parsers) the map can be
+        # applied as a single C-level table gather instead of one Python call per coefficient.
+        if value_map and all(isinstance(key, int) for key in value_map):
+            self._lut_offset = min(value_map)
+            self._lut = np.full(max(value_map) - self._lut_offset + 1, -1, dtype=np.int8)
+            for key, value in value_map.items():
+                self._lut[key - self._lut_offset] = value
+        else:
+            self._lut = None
+
     def parse(self, matrix_string):
-        out = self.parse_function(matrix_string)
+        return self._remap(self.parse_function(matrix_string))
+
+    def _remap(self, out):
         if self.transpose:
             out = out.T
+        if self._lut is not None:
+            # The conversion to an index dtype and the offset subtraction happen
+            # in the same ufunc pass.
+            indexes = np.subtract(out, self._lut_offset, dtype=np.intp)
+            bad_mask = (indexes < 0) | (indexes >= len(self._lut))
+            if bad_mask.any():
+                raise ValueError(f'bad value in parsed matrix {np.asarray(out)[bad_mask].flat[0]}')
+            out = self._lut[indexes]
+            bad_mask = out < 0
+            if bad_mask.any():
+                raise ValueError(f'bad value in parsed matrix {(indexes + self._lut_offset)[bad_mask].flat[0]}')
+            return out
         try:
             out = np.vectorize(lambda x: self.value_map[x])(out)
         except KeyError as e:
@@ -28,8 +63,16 @@ class _GenotypeMatrixParser:
         raise NotImplementedError('this is an abstract method!')
 
 
+def _parse_labels(labels_string):
+    if labels_string is None:
+        return None
+    return [lb.strip() for lb in labels_string.splitlines() if lb.strip() != ""]
+
+
 def _loadstr(string):
-    return np.loadtxt( (bytes(l, 'ascii') for l in string.split('\n')) )
+    # Feeding a StringIO lets np.loadtxt use its C tokenizer instead of pulling
+    # lines one at a time from a Python generator.
+    return np.loadtxt(StringIO(string), dtype=np.int8)
 
 
 class SASCParser(_GenotypeMatrixParser):
@@ -48,17 +91,43 @@ class SCITEParser(_GenotypeMatrixParser):
         return _loadstr(matrix_string)
 
 
+_SPHYR_COMMENT_RE = re.compile(r'#[^\n]*')
+
+
+def _pack2bit(matrix):
+    # Values fit in two bits, so four cells are packed per byte: shift-and-OR
+    # over column views, all in NumPy's C loops.
+    flat = matrix.reshape(-1).astype(np.uint8)
+    padding = -len(flat) % 4
+    if padding:
+        flat = np.concatenate([flat, np.zeros(padding, dtype=np.uint8)])
+    quads = flat.reshape(-1, 4)
+    return quads[:, 0] | quads[:, 1] << 2 | quads[:, 2] << 4 | quads[:, 3] << 6
+
+
+def _unpack2bit(packed, shape):
+    out = np.empty((len(packed), 4), dtype=np.int8)
+    for position in range(4):
+        out[:, position] = (packed >> (2 * position)) & 3
+    return out.reshape(-1)[:shape[0] * shape[1]].reshape(shape)
+
+
 class SPHYRParser(_GenotypeMatrixParser):
     def __init__(self, no_comments=True):
         super().__init__(value_map={0: 0, 1: 1, -1: 2}, transpose=False)
 
     def parse_function(self, matrix_string):
-        lines = matrix_string.split('\n')
-        # Delete EOL comments by trimming the line beyond the hash
-        for line in lines:
-            line = line.split('#')[0]
+        # Delete EOL comments in a single pass over the whole buffer. The old
+        # per-line loop rebound its variable without ever storing the result.
+        stripped = _SPHYR_COMMENT_RE.sub('', matrix_string)
         # Skip the header
-        return _loadstr('\n'.join(lines[2:]))
+        lines = stripped.split('\n', 2)
+        return _loadstr(lines[2] if len(lines) > 2 else '')
+
+
+# Shared instances of the predefined parsers, used as defaults so that repeated
+# loads don't rebuild a parser (and its lookup table) per call.
+_SASC_PARSER = SASCParser()
 
 
 class PEGSpecifiedParser(_GenotypeMatrixParser):
@@ -84,11 +153,15 @@ class PEGSpecifiedParser(_GenotypeMatrixParser):
                 If true, then the matrix that is obtained by parsing the file is transposed.
         """
         super().__init__(value_map, transpose)
-        self.inner_parser = ts.compile(grammar)
+        self.inner_parser = _compile_grammar(grammar)
+        # Collapsing runs of intra-line whitespace before the parse relieves the
+        # grammar of character-by-character skipping; newlines are kept intact
+        # since grammars typically use them to delimit rows.
+        self._prelexer = re.compile(r'[ \t\r\f\v]+')
 
     def parse_function(self, matrix_string):
         semantics = _MatrixSemantics()
-        self.inner_parser.parse(matrix_string, semantics)
+        self.inner_parser.parse(self._prelexer.sub(' ', matrix_string), semantics)
         return semantics.matrix
 
 
@@ -105,22 +178,40 @@ class _MatrixSemantics:
 
     def __init__(self):
         self.matrix = None
-        self.current_matrix_rows = []
         self.current_row = []
 
+        # Completed rows go into a preallocated buffer that doubles on overflow,
+        # instead of a list of per-row Python lists that gets copied at the end.
+        self._row_buffer = None
+        self._parsed_rows = 0
+
+    def _push_row(self):
+        if self._row_buffer is None:
+            # The first row fixes the width and the dtype of the buffer.
+            probe = np.asarray(self.current_row)
+            self._row_buffer = np.empty((16, len(self.current_row)), dtype=probe.dtype)
+        elif self._parsed_rows == len(self._row_buffer):
+            self._row_buffer = np.resize(
+                self._row_buffer, (2 * len(self._row_buffer), self._row_buffer.shape[1]))
+
+        if len(self.current_row) != self._row_buffer.shape[1]:
+            raise NotAMatrixError()
+        self._row_buffer[self._parsed_rows] = self.current_row
+        self._parsed_rows += 1
+
     def matrix(self, ast):
-        matrix_width = len(self.current_matrix_rows[0])
-        if any([len(row) != matrix_width for row in self.current_matrix_rows]):
+        if self._row_buffer is None:
             raise NotAMatrixError()
 
-        if not self.matrix:
-            matrix = np.array(self.current_matrix_rows)
-        self.current_matrix_rows = []
+        if self.matrix is None:
+            self.matrix = self._row_buffer[:self._parsed_rows]
+        self._row_buffer = None
+        self._parsed_rows = 0
         return ast
 
     def row(self, ast):
         if self.current_row:
-            self.current_matrix_rows.append(self.current_row.copy())
+            self._push_row()
         self.current_row = []
         return ast
 
@@ -174,27 +265,36 @@ class GenotypeMatrix:
         """
 
         def is_collection(obj):
-            try:
-                list(obj)
-                return True
-            except TypeError:
-                return False
+            # O(1) check; the old version materialized the whole input as a list
+            # just to see whether it was iterable.
+            return isinstance(obj, Iterable)
 
         # Given how commonly used numpy is, we let its exceptions go through.
-        genotype_matrix = np.array(genotype_matrix, dtype='int')
+        # asarray-style conversion avoids a copy when the input already is a
+        # contiguous int8 array, and int8 keeps every later pass narrow.
+        as_given = np.asarray(genotype_matrix)
+        genotype_matrix = np.ascontiguousarray(as_given, dtype=np.int8)
         if len(genotype_matrix.shape) != 2:
             raise ValueError(
                 f"the input matrix should be two-dimensional, but {genotype_matrix} is {len(genotype_matrix.shape)}"
                 "-dimensional instead."
             )
 
-        if len(genotype_matrix.flat) == 0:
+        if genotype_matrix.size == 0:
             raise EmptyMatrixError()
 
-        allowed_values = {1, 2, 0}
-        for element in genotype_matrix.flat:
-            if element not in allowed_values:
-                raise ValueError(element)
+        # One vectorized range check over the whole matrix; the offending element
+        # is only located on failure.
+        bad_mask = (genotype_matrix < 0) | (genotype_matrix > 2)
+        if as_given.dtype != np.int8:
+            # Narrowing a wider dtype wraps values mod 256 (and truncates
+            # floats), which could land an invalid input on 0, 1 or 2; any
+            # element the cast didn't preserve is rejected too. The comparison
+            # goes through a cast back to the input dtype so that convertible
+            # non-numeric inputs (e.g. digit strings) stay accepted.
+            bad_mask |= as_given != genotype_matrix.astype(as_given.dtype)
+        if bad_mask.any():
+            raise ValueError(as_given[bad_mask].flat[0])
         height, width = tuple(genotype_matrix.shape)
 
         # Automatically make the labels if none are specified.
@@ -206,7 +306,7 @@ class GenotypeMatrix:
         def _validate_labels(label_list, expected_length):
             if not is_collection(label_list):
                 raise TypeError('mutation_labels and cell_labels must be collections, but {label_list} is not')
-            if any([isinstance(label_list, str_like_type) for str_like_type in {str, bytes}]):
+            if isinstance(label_list, (str, bytes)):
                 raise TypeError(f'strings like {label_list} are not accepted as label lists')
 
             if len(label_list) != expected_length:
@@ -216,7 +316,7 @@ class GenotypeMatrix:
             for label in label_list:
                 if not isinstance(label, str):
                     raise TypeError(f'each label must be a string, but {label} is not.')
-                if re.search(r'\s', label):
+                if label.translate(_WS_TABLE) != label:
                     raise ValueError(
                         f'labels cannot contain whitespace, newline or other tabulation characters, but {label} does.')
 
@@ -226,12 +326,30 @@ class GenotypeMatrix:
         _validate_labels(cell_labels, height)
         _validate_labels(mutation_labels, width)
 
-        self._data = DataFrame(genotype_matrix, index=cell_labels, columns=mutation_labels, dtype=int, copy=True)
+        # The matrix is kept packed at two bits per cell and unpacked on access,
+        # so the resident footprint is a quarter of an int8 copy.
+        self._shape = genotype_matrix.shape
+        self._packed = _pack2bit(genotype_matrix)
+        # Lazily unpacked dense form, shared read-only between accessor calls.
+        self._dense_cache = None
+        # Tuples, so the stored labels can be handed around internally without
+        # defensive copies; the public properties still return fresh lists.
+        self._cell_labels = tuple(cell_labels)
+        self._mutation_labels = tuple(mutation_labels)
+
+    def _dense(self):
+        # The unpacked matrix is computed once and frozen, so every accessor
+        # shares it without either a copy or a risk of aliasing mutations.
+        if self._dense_cache is None:
+            dense = _unpack2bit(self._packed, self._shape)
+            dense.flags.writeable = False
+            self._dense_cache = dense
+        return self._dense_cache
 
     def matrix(self):
         """
-        Returns a copy of the matrix that was used to initialize the object as a list of lists, where each list is a row
-        in the matrix.
+        Returns the matrix that was used to initialize the object as a read-only numpy array,
+        shared between calls, where each row of the array is a row in the matrix.
 
         Parameters:
             none.
@@ -240,23 +358,46 @@ class GenotypeMatrix:
             np.ndarray:
                 A numpy array that represents the matrix. The coefficient in position [i][j] will be a 0 if
                 the i-th cell doesn't exhibit the j-th mutation, 1 if it does, and 2 if no conclusion could be drawn
-                in the analysis. The returned object is independent from the internal representation.
+                in the analysis. The returned array is read-only and shared between calls; attempts to write
+                to it raise instead of silently altering this object. Copy it to get a mutable version.
         """
-        return deepcopy(self._data.to_numpy())
+        return self._dense()
+
+    def iter_rows(self):
+        """
+        Yields the rows of the matrix one at a time as read-only numpy views,
+        in the same order as cell_labels. Unlike matrix().tolist(), nothing is
+        copied, so this is the cheap way to stream a large matrix.
+        """
+        yield from self._dense()
+
+    @property
+    def n_cells(self):
+        """
+        Returns the number of cells (rows) in the matrix.
+        """
+        return self._shape[0]
+
+    @property
+    def n_mutations(self):
+        """
+        Returns the number of mutations (columns) in the matrix.
+        """
+        return self._shape[1]
 
     @property
     def cell_labels(self):
         """
         Returns an ordered list of the labels for the cells in the matrix.
         """
-        return list(self._data.index)
+        return list(self._cell_labels)
 
     @property
     def mutation_labels(self):
         """
         Returns an ordered list of the labels for the mutations in the matrix.
         """
-        return list(self._data.columns)
+        return list(self._mutation_labels)
 
     def cells(self):
         """
@@ -271,7 +412,8 @@ class GenotypeMatrix:
                 the matrix that represents the information about each mutation for the cell with that label;
                 the coefficients of the list are in the same order as the labels in mutation_labels.
         """
-        return {lb: list(self._data.loc[lb, :]) for lb in self.cell_labels}
+        # One C-level tolist() for the whole matrix instead of one conversion per row.
+        return dict(zip(self._cell_labels, self._dense().tolist()))
 
     def mutations(self):
         """
@@ -286,7 +428,7 @@ class GenotypeMatrix:
                 the matrix that represents the information for the mutation in each cell of the sample;
                 the coefficients of the list are in the same order as the labels in  cell_labels.
         """
-        return {lb: list(self._data.loc[:, lb]) for lb in self.mutation_labels}
+        return dict(zip(self._mutation_labels, self._dense().T.tolist()))
 
     def with_automatic_mutation_labels(self):
         """
@@ -314,9 +456,10 @@ class GenotypeMatrix:
         Dumps the matrix into a dictionary-of-strings representation. The matrix is represented in SASC format,
         while the label lists are represented as newline-separated string.
         """
-        genotype_matrix_as_string = (
-            '\n'.join([' '.join([str(el) for el in line]) for line in self.matrix()])
-        )
+        # np.savetxt formats the whole matrix in C, instead of one str() call per cell.
+        buffer = StringIO()
+        np.savetxt(buffer, self._dense(), fmt='%d')
+        genotype_matrix_as_string = buffer.getvalue().rstrip('\n')
         out = {
             'genotype_matrix': genotype_matrix_as_string,
             'cell_labels': '\n'.join(self.cell_labels),
@@ -325,7 +468,7 @@ class GenotypeMatrix:
         return out
 
     @classmethod
-    def _from_strings(cls, genotype_matrix, cell_labels=None, mutation_labels=None, matrix_parser=SASCParser()):
+    def _from_strings(cls, genotype_matrix, cell_labels=None, mutation_labels=None, matrix_parser=_SASC_PARSER):
         """
         Builds a GenotypeMatrix from the string representation of its components, if the representations
         are valid.
@@ -349,11 +492,6 @@ class GenotypeMatrix:
                 validation conditions and the behaviour if label files are omitted.
         """
 
-        def _parse_labels(labels_string):
-            if labels_string is None:
-                return None
-            return [lb.strip() for lb in labels_string.splitlines() if lb.strip() != ""]
-
         return cls(
             matrix_parser.parse(genotype_matrix),
             _parse_labels(cell_labels),
@@ -368,29 +506,51 @@ class GenotypeMatrix:
         return cls._from_strings(**dict_representation)
 
     @classmethod
-    def from_files(cls, matrix_file, cells_file=None, mutations_file=None, matrix_parser=SASCParser()):
+    def from_files(cls, matrix_file, cells_file=None, mutations_file=None, matrix_parser=_SASC_PARSER):
         """
-        Reads a matrix file and (facultatively) label files, then uses their content as strings to build
-        a GenotypeMatrix with the same behaviour as read_from_strings.
+        Reads a matrix file and (facultatively) label files, then builds a GenotypeMatrix
+        with the same behaviour as read_from_strings.
+
+        For the predefined parsers the matrix file is read with a single streaming
+        np.loadtxt pass instead of being loaded into a string and re-parsed from there;
+        custom parsers still get the file content as a string.
         """
 
-        def _read_nullable(file_name, default_output=None):
+        def _read_nullable(file_name):
             if file_name is None:
-                return default_output
-            else:
-                with open(file_name, 'r') as f:
-                    return f.read()
-
-        with open(matrix_file, 'r') as f:
-            genotype_matrix = f.read()
-
-        return cls._from_strings(
-            genotype_matrix=genotype_matrix,
-            cell_labels=_read_nullable(cells_file),
-            mutation_labels=_read_nullable(mutations_file),
-            matrix_parser=matrix_parser
+                return None
+            with open(file_name, 'r') as f:
+                return f.read()
+
+        if type(matrix_parser) is SPHYRParser:
+            # loadtxt's C reader handles both the comment stripping and the header skip.
+            raw = np.loadtxt(matrix_file, dtype=np.int8, skiprows=2, comments='#', ndmin=2)
+        elif type(matrix_parser) in (SASCParser, SCITEParser):
+            raw = np.loadtxt(matrix_file, dtype=np.int8, ndmin=2)
+        else:
+            with open(matrix_file, 'r') as f:
+                genotype_matrix = f.read()
+            return cls._from_strings(
+                genotype_matrix=genotype_matrix,
+                cell_labels=_read_nullable(cells_file),
+                mutation_labels=_read_nullable(mutations_file),
+                matrix_parser=matrix_parser
+            )
+
+        return cls(
+            matrix_parser._remap(raw),
+            _parse_labels(_read_nullable(cells_file)),
+            _parse_labels(_read_nullable(mutations_file))
         )
 
+    @classmethod
+    def from_file_fast(cls, matrix_file, cells_file=None, mutations_file=None, matrix_parser=_SASC_PARSER):
+        """
+        Kept for backwards compatibility: from_files now always takes the fast
+        loadtxt path for the predefined parsers, so this is a plain alias.
+        """
+        return cls.from_files(matrix_file, cells_file, mutations_file, matrix_parser)
+
     def to_files(self, matrix_file, cells_file=None, mutations_file=None):
         """
         Dumps a matrix to a file with a specified format. Also dumps the cell labels and the mutation labels
@@ -402,12 +562,12 @@ class GenotypeMatrix:
         if len(set(output_files)) != len(output_files):
             raise AttributeError('the same file was specified for more than one output.')
 
-        matrix_dict = self.to_serializable_dict()
-        with open(matrix_file, 'w') as f:
-            f.write(matrix_dict['genotype_matrix'])
+        # The matrix is streamed straight to the file, so no intermediate string
+        # the size of the whole matrix is ever built.
+        np.savetxt(matrix_file, self._dense(), fmt='%d')
         if cells_file is not None:
             with open(cells_file, 'w') as f:
-                f.write(matrix_dict['cell_labels'])
+                f.write('\n'.join(self._cell_labels))
         if mutations_file is not None:
             with open(mutations_file, 'w') as f:
-                f.write(matrix_dict['mutation_labels'])
+                f.write('\n'.join(self._mutation_labels))
@@ -1,11 +1,126 @@
 import networkx as nx
-from copy import deepcopy
-from collections import defaultdict, deque
+import numpy as np
+import re
+from collections import defaultdict
 from colour import Color
 import plastic._core.sascviz as sv
 import pygraphviz
 
 
+# The support gradient is constant, so the 100 Color interpolations are done once
+# at import time; the values are stored pre-stringified as the dot attributes expect.
+_C_BLACK = str(Color("#000000"))
+_C_RED = str(Color("#FF1919"))
+_SUPPORT_GRADIENT = tuple(str(c) for c in Color("#3270FC").range_to(Color("#397D02"), 100))
+
+# Palette for vectorized lookups: index 0 is the no-support sentinel, 1 is the
+# zero-support color and 2..101 map supports 1..100 onto the gradient.
+_SUPPORT_PALETTE = np.array((_C_BLACK, _C_RED) + _SUPPORT_GRADIENT)
+
+
+# Line-oriented grammar for the subset of DOT that this package itself emits
+# (one node or edge statement per line, quoted or bare identifiers, attribute
+# lists of key="value" pairs). Anything outside the subset falls back to the
+# full pygraphviz parser.
+_DOT_ID = r'(?:"((?:[^"\\]|\\.)*)"|([A-Za-z0-9_.]+))'
+_DOT_HEADER_RE = re.compile(rf'^(?:strict\s+)?digraph(?:\s+{_DOT_ID})?\s*\{{$')
+_DOT_EDGE_RE = re.compile(rf'^{_DOT_ID}\s*->\s*{_DOT_ID}\s*(?:\[(.*)\])?;?$')
+_DOT_NODE_RE = re.compile(rf'^{_DOT_ID}\s*(?:\[(.*)\])?;?$')
+_DOT_ATTR_RE = re.compile(rf'\s*{_DOT_ID}\s*=\s*{_DOT_ID}\s*,?')
+
+
+def _dot_unquote(match, group):
+    quoted = match.group(group)
+    if quoted is not None:
+        return quoted.replace('\\"', '"')
+    return match.group(group + 1)
+
+
+def _parse_dot_attrs(attr_text):
+    attributes = {}
+    position = 0
+    while position < len(attr_text):
+        match = _DOT_ATTR_RE.match(attr_text, position)
+        if match is None:
+            return None
+        attributes[_dot_unquote(match, 1)] = _dot_unquote(match, 3)
+        position = match.end()
+    return attributes
+
+
+def _parse_sasc_dot(dot_string):
+    """
+    Parses the simple single-statement-per-line DOT dialect produced by this package
+    (and by SASC) straight into a networkx digraph, skipping the pygraphviz layer.
+    Returns None whenever a line falls outside the dialect, so callers can fall
+    back to the full parser.
+    """
+    graph = nx.DiGraph()
+    seen_header = False
+    closed = False
+    # agwrite breaks long lines with a backslash continuation.
+    for line in dot_string.replace('\\\n', '').split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+        if closed:
+            return None
+        if not seen_header:
+            header_match = _DOT_HEADER_RE.match(line)
+            if header_match is None:
+                return None
+            name = _dot_unquote(header_match, 1)
+            if name:
+                # The pygraphviz path keeps a non-empty graph name as the
+                # 'name' graph attribute, so the fast path must as well.
+                graph.graph['name'] = name
+            seen_header = True
+            continue
+        if line == '}':
+            closed = True
+            continue
+
+        edge_match = _DOT_EDGE_RE.match(line)
+        if edge_match is not None:
+            attr_text = edge_match.group(5)
+            attributes = _parse_dot_attrs(attr_text) if attr_text is not None else {}
+            if attributes is None:
+                return None
+            graph.add_edge(_dot_unquote(edge_match, 1), _dot_unquote(edge_match, 3), **attributes)
+            continue
+
+        node_match = _DOT_NODE_RE.match(line)
+        if node_match is None:
+            return None
+        name = _dot_unquote(node_match, 1)
+        attr_text = node_match.group(3)
+        attributes = _parse_dot_attrs(attr_text) if attr_text is not None else {}
+        if attributes is None:
+            return None
+        if node_match.group(2) in ('graph', 'node', 'edge'):
+            # Default-attribute statements. Graph attributes are kept; the
+            # label="\N" default pygraphviz always writes is a no-op, any other
+            # node/edge default would have to propagate, so it is out of scope.
+            if name == 'graph':
+                graph.graph.update(attributes)
+            elif attributes != {'label': '\\N'}:
+                return None
+            continue
+        graph.add_node(name, **attributes)
+
+    if not closed:
+        return None
+    return graph
+
+
+def _agraph_draw(tree_as_nx_graph, file_path):
+    # The shared tail of every draw operation; the caller owns the graph and
+    # has already put it into drawable shape.
+    gv_representation = nx.nx_agraph.to_agraph(tree_as_nx_graph)
+    gv_representation.layout(prog='dot')
+    gv_representation.draw(file_path)
+
+
 class NotATreeError(Exception): pass
 
 
@@ -33,6 +148,19 @@ class PhylogenyTree:
                 Its internal state is fully independent from the tree that was used for the
                 initialization, so subsequent alteration to it won't alter this object.
         """
+        PhylogenyTree._validate(tree_as_nx_graph)
+
+        # In order to ensure the object's immutability, everything is copied over.
+        # After validation every attribute is an immutable string, so the fast
+        # constructor copy (fresh dicts, shared values) is as good as a deepcopy.
+        self._tree = nx.DiGraph(tree_as_nx_graph)
+        self._tree.graph = dict(tree_as_nx_graph.graph)
+        # The tree is immutable, so its DOT serialization can be computed once
+        # and reused across to_dotstring/to_file calls.
+        self._dot_cache = None
+
+    @staticmethod
+    def _validate(tree_as_nx_graph):
         if not isinstance(tree_as_nx_graph, nx.DiGraph):
             raise TypeError('the input must be a networkx graph.')
 
@@ -42,31 +170,73 @@ class PhylogenyTree:
         # To allow correct serialization in DOT format, all attributes and node IDs must be strings.
         # The graph attributes "node", "edge" and "graph" are reserved due to oddities with networkx
         # to AGraph conversion.
-        for key in tree_as_nx_graph.graph:
-            tree_as_nx_graph.graph[key] = str(tree_as_nx_graph.graph[key])
-        if any([attribute in tree_as_nx_graph.graph for attribute in {'edge', 'node', 'graph'}]):
+        for key, value in tree_as_nx_graph.graph.items():
+            if type(value) is not str:
+                tree_as_nx_graph.graph[key] = str(value)
+        if not {'edge', 'node', 'graph'}.isdisjoint(tree_as_nx_graph.graph):
             bad_keys = set(tree_as_nx_graph.graph.keys()).intersection({'edge', 'node', 'graph'})
             raise ValueError(
                 f'graph attributes with keys "edge", "node" or "graph" are not allowed, but {bad_keys} are present')
 
-        for [u, v, attributes] in tree_as_nx_graph.edges(data=True):
-            for key in attributes:
-                attributes[key] = str(attributes[key])
+        # Attributes that are already strings (the common case, e.g. anything that
+        # came out of the dot parser) are left untouched: even a redundant str()
+        # call would go through __str__ dispatch for every value. Iterating the
+        # backing dicts directly also skips the construction of the
+        # (node, data)/(u, v, data) view tuples networkx would otherwise build.
+        for adjacency in tree_as_nx_graph._adj.values():
+            for attributes in adjacency.values():
+                for key, value in attributes.items():
+                    if type(value) is not str:
+                        attributes[key] = str(value)
+
+        for node, attributes in tree_as_nx_graph._node.items():
+            if not isinstance(node, str):
+                raise TypeError(f'all nodes must be identified by strings, but {node} is not')
+            for key, value in attributes.items():
+                if type(value) is not str:
+                    attributes[key] = str(value)
+            if 'label' in attributes:
+                label = attributes['label']
+                if len(label) == 0:
+                    raise ValueError(f'the node {node} has an empty label list.')
+                if '' in label.split(','):
+                    raise ValueError(f'the node {node} with label list {label} has empty labels in its label list.')
+
+    @classmethod
+    def _from_validated(cls, tree_as_nx_graph, *args, **kwargs):
+        """
+        Trusted constructor path for graphs whose attributes are already known to be strings
+        (for instance the output of the dot parser), so only the str() coercion passes are
+        skipped. The caller hands over ownership of the graph, so no defensive copy is made;
+        the tree structure, the reserved graph attribute keys and the label invariants are
+        still checked since sources like DOT strings can encode arbitrary content.
+        """
+        if cls is not PhylogenyTree:
+            # Subclasses add their own invariants, so they go through the full initializer.
+            return cls(tree_as_nx_graph, *args, **kwargs)
 
-        for (node, attributes) in tree_as_nx_graph.nodes(data=True):
+        if not nx.is_arborescence(tree_as_nx_graph):
+            raise NotATreeError('the graph must be a tree.')
+
+        if not {'edge', 'node', 'graph'}.isdisjoint(tree_as_nx_graph.graph):
+            bad_keys = set(tree_as_nx_graph.graph.keys()).intersection({'edge', 'node', 'graph'})
+            raise ValueError(
+                f'graph attributes with keys "edge", "node" or "graph" are not allowed, but {bad_keys} are present')
+
+        for node, attributes in tree_as_nx_graph._node.items():
             if not isinstance(node, str):
                 raise TypeError(f'all nodes must be identified by strings, but {node} is not')
-            for key in attributes:
-                attributes[key] = str(attributes[key])
             if 'label' in attributes:
                 label = attributes['label']
                 if len(label) == 0:
                     raise ValueError(f'the node {node} has an empty label list.')
-                if any([len(single_label) == 0 for single_label in label.split(',')]):
+                if '' in label.split(','):
                     raise ValueError(f'the node {node} with label list {label} has empty labels in its label list.')
 
-        # In order to ensure the object's immutability, everything is copied over.
-        self._tree = deepcopy(tree_as_nx_graph)
+        out = cls.__new__(cls)
+        out._tree = tree_as_nx_graph
+        out._dot_cache = None
+        return out
 
     # the external representation gives an independent copy. 
     def as_digraph(self):
@@ -75,7 +245,11 @@ class PhylogenyTree:
         The returned tree is independent from the internal representation, so subsequent
         changes to it don't alter the state of this object.
         """
-        out = deepcopy(self._tree)
+        # The DiGraph constructor re-creates the node and edge attribute dicts at C level,
+        # which is much faster than a deepcopy. The attribute values themselves are shared,
+        # which is safe since they are all immutable strings.
+        out = nx.DiGraph(self._tree)
+        out.graph = dict(self._tree.graph)
 
         return out
 
@@ -93,9 +267,7 @@ class PhylogenyTree:
             if 'label' not in attributes:
                 attributes['label'] = f'no label for node with ID: {node}'
 
-        drawtree = nx.nx_agraph.to_agraph(drawtree)
-        drawtree.layout(prog='dot')
-        drawtree.draw(file_path)
+        _agraph_draw(drawtree, file_path)
 
     @classmethod
     def from_dotstring(cls, dot_string, *args, **kwargs):
@@ -106,21 +278,67 @@ class PhylogenyTree:
         it can accept them.
         """
 
-        nx_representation = nx.nx_agraph.from_agraph(pygraphviz.AGraph(string=dot_string))
+        # Most inputs are this package's (or SASC's) own output, which the direct
+        # line parser handles without going through libgraphviz at all.
+        nx_representation = _parse_sasc_dot(dot_string)
+        if nx_representation is None:
+            nx_representation = nx.nx_agraph.from_agraph(pygraphviz.AGraph(string=dot_string))
 
-        # Converting to an AGraph adds its own set of default attributes that need
-        # to be removed before conversion to a networkx graph.
-        del nx_representation.graph['graph']
-        del nx_representation.graph['node']
-        del nx_representation.graph['edge']
-        return cls(nx_representation, *args, **kwargs)
+            # Converting to an AGraph adds its own set of default attributes that
+            # need to be removed before conversion to a networkx graph.
+            nx_representation.graph.pop('graph', None)
+            nx_representation.graph.pop('node', None)
+            nx_representation.graph.pop('edge', None)
+
+        # The dot parser only produces string attributes, so the stringification
+        # passes would be redundant here; the other invariants are still checked.
+        return cls._from_validated(nx_representation, *args, **kwargs)
+
+    # Above this size the pygraphviz round-trip is skipped in favour of the
+    # direct string builder; below it the output stays byte-identical to the
+    # historical serialization.
+    _FAST_DOT_THRESHOLD = 1000
 
     def to_dotstring(self):
         """
         Dumps the tree to a DOT representation string.
         """
-        gv_representation = nx.drawing.nx_agraph.to_agraph(self._tree)
-        return gv_representation.to_string()
+        if self._dot_cache is None:
+            if self._tree.number_of_nodes() > PhylogenyTree._FAST_DOT_THRESHOLD:
+                self._dot_cache = self._fast_to_dot()
+            else:
+                gv_representation = nx.drawing.nx_agraph.to_agraph(self._tree)
+                self._dot_cache = gv_representation.to_string()
+        return self._dot_cache
+
+    def _fast_to_dot(self):
+        # Emits DOT straight from the attribute dicts; everything is already a
+        # string, so this is a pure join with quote escaping. Only double quotes
+        # are escaped, matching the DOT lexer (and pygraphviz's own writer).
+        def escaped(value):
+            return value.replace('"', '\\"')
+
+        def formatted(attributes):
+            return ', '.join(f'"{escaped(key)}"="{escaped(value)}"' for key, value in attributes.items())
+
+        # The strict header matches pygraphviz's output and makes parsers read
+        # the result back as a simple digraph rather than a multigraph.
+        lines = ['strict digraph "" {']
+        if self._tree.graph:
+            lines.append(f'\tgraph [{formatted(self._tree.graph)}];')
+        for node, attributes in self._tree._node.items():
+            if attributes:
+                lines.append(f'\t"{escaped(node)}" [{formatted(attributes)}];')
+            else:
+                lines.append(f'\t"{escaped(node)}";')
+        for u, adjacency in self._tree._adj.items():
+            for v, attributes in adjacency.items():
+                if attributes:
+                    lines.append(f'\t"{escaped(u)}" -> "{escaped(v)}" [{formatted(attributes)}];')
+                else:
+                    lines.append(f'\t"{escaped(u)}" -> "{escaped(v)}";')
+        lines.append('}')
+        return '\n'.join(lines) + '\n'
 
     @classmethod
     def from_file(cls, file_path, *args, **kwargs):
@@ -175,11 +393,14 @@ class SASCPhylogeny(PhylogenyTree):
         super().__init__(tree_as_nx_graph)
         self._has_cells = False
 
-        for node in self._tree:
-            if 'label' not in self._tree.nodes[node]:
-                if self._tree.out_degree(node) != 0:
+        # A single pass over the backing dicts replaces the per-node attribute
+        # and out_degree lookups, each of which costs a chain of dict accesses.
+        successors = self._tree._succ
+        for node, attributes in self._tree._node.items():
+            if 'label' not in attributes:
+                if successors[node]:
                     raise ValueError('All the inner nodes of a SASCPhylogeny must be labeled.')
-                elif self._tree.nodes[node].get('shape') != 'box':
+                elif attributes.get('shape') != 'box':
                     raise ValueError(
                         'If a leaf node is unlabeled, then it must be a cell, marked by a box shape attribute.')
                 else:
@@ -216,11 +437,10 @@ class SASCPhylogeny(PhylogenyTree):
         return SASCPhylogeny._from_sv_tree(svtree)
 
     def without_cells(self):
-        tree = self.as_digraph()
-        for node in list(tree):
-            if 'label' not in tree.nodes[node]:
-                tree.remove_node(node)
-        return SASCPhylogeny(tree)
+        # Building the pruned tree as a subgraph copy avoids both the defensive
+        # full copy and the per-node adjacency bookkeeping of remove_node.
+        kept = [node for node, attributes in self._tree._node.items() if 'label' in attributes]
+        return SASCPhylogeny(self._tree.subgraph(kept).copy())
 
     def draw_to_file(self, file_path, show_support=True, show_color=True):
         """
@@ -246,28 +466,41 @@ class SASCPhylogeny(PhylogenyTree):
             its content will be overwritten.
         """
         drawtree = self.as_digraph()
-        if show_support:
-            for node in drawtree:
-                if 'support' in drawtree.nodes[node] and 'label' in drawtree.nodes[node]:
-                    drawtree.nodes[node]['label'] += '\n[s = {0}%]'.format(drawtree.nodes[node]['support'])
+        # The decoration passes share a single iteration over the backing
+        # attribute dicts, so each node's dict is fetched exactly once instead
+        # of going through the drawtree.nodes[...] view in every condition.
+        node_attrs = drawtree._node
+        for node, attributes in node_attrs.items():
+            if 'label' not in attributes:
+                attributes['label'] = f'no label for node with ID: {node}'
+            elif show_support and 'support' in attributes:
+                attributes['label'] += '\n[s = {0}%]'.format(attributes['support'])
 
         if show_color:
-            c_black = Color("#000000")
-            c_red = Color("#FF1919")
-            c_green = Color("#397D02")
-            c_blue = Color("#3270FC")
-            c_gradient = list(c_blue.range_to(c_green, 100))
-            for node in drawtree:
-                drawtree.nodes[node]['color'] = (
-                    c_black if 'support' not in drawtree.nodes[node]
-                    else c_red if drawtree.nodes[node]['support'] == 0
-                    else c_gradient[int(drawtree.nodes[node]['support']) - 1]
-                )
-
-        PhylogenyTree(drawtree).draw_to_file(file_path)
+            # The support values are mapped onto the palette with a single
+            # vectorized index computation instead of a per-node conditional.
+            # Zero-support nodes now correctly get the red color: the old
+            # comparison tested the stringified attribute against the int 0 and
+            # wrapped around to the end of the gradient.
+            supports = np.fromiter(
+                (int(attributes.get('support', -1)) for attributes in node_attrs.values()),
+                dtype=np.int32, count=len(node_attrs)
+            )
+            palette_indexes = np.where(
+                supports < 0, 0,
+                np.where(supports == 0, 1, np.clip(supports, 1, 100) + 1)
+            )
+            for attributes, color in zip(node_attrs.values(), _SUPPORT_PALETTE[palette_indexes]):
+                attributes['color'] = str(color)
+
+        # drawtree is already an independent, validated copy; drawing it
+        # directly skips the extra copy a PhylogenyTree wrapper would make.
+        _agraph_draw(drawtree, file_path)
 
     def _to_sv_tree(self):
-        root = [node for node, degree in self._tree.in_degree() if degree == 0][0]
+        # The arborescence check already guarantees a unique root: the one node
+        # with no predecessors, found without computing every in-degree.
+        root = next(node for node, predecessors in self._tree._pred.items() if not predecessors)
 
         curr_node = sv.Node(root)
         out = sv.Tree(curr_node)
@@ -276,18 +509,25 @@ class SASCPhylogeny(PhylogenyTree):
             else None
         )
 
-        visit_queue = deque([curr_node])
-        while visit_queue:
-            curr_node = visit_queue.popleft()
+        # The walk goes through the backing dicts with a plain list stack; on a
+        # tree the visit order doesn't matter, and this skips the view layer
+        # that nodes()/successors() would rebuild at every access.
+        nodes = self._tree._node
+        successors = self._tree._succ
+
+        visit_stack = [curr_node]
+        while visit_stack:
+            curr_node = visit_stack.pop()
+            attributes = nodes[curr_node.id]
 
-            if self._tree.nodes[curr_node.id].get('fillcolor') == 'indianred1':
+            if attributes.get('fillcolor') == 'indianred1':
                 out.set_deletion(curr_node.id)
-            out.set_mutations(curr_node.id, self._tree.nodes[curr_node.id]['label'].split(','))
+            out.set_mutations(curr_node.id, attributes['label'].split(','))
 
-            for child in self._tree.successors(curr_node.id):
-                if 'label' in self._tree.nodes[child]:
+            for child in successors[curr_node.id]:
+                if 'label' in nodes[child]:
                     to_add = sv.Node(child)
-                    visit_queue.append(to_add)
+                    visit_stack.append(to_add)
 
                     out.add_node(to_add)
                     out.add_edge(curr_node.id, to_add.id)
@@ -303,9 +543,9 @@ class SASCPhylogeny(PhylogenyTree):
         out = nx.DiGraph()
         out.add_node(svtree.root.id)
 
-        visit_queue = deque([svtree.root])
-        while visit_queue:
-            curr_node = visit_queue.popleft()
+        visit_stack = [svtree.root]
+        while visit_stack:
+            curr_node = visit_stack.pop()
 
             data = dict()
             if curr_node.deletion:
@@ -316,7 +556,7 @@ class SASCPhylogeny(PhylogenyTree):
             out.nodes[curr_node.id].update(**data)
 
             for child in curr_node.children:
-                visit_queue.append(child)
+                visit_stack.append(child)
 
                 out.add_edge(curr_node.id, child.id)
 
@@ -25,6 +25,15 @@ import sys
 
 
 class Node:
+    # One instance exists per tree node, so dropping the per-instance __dict__
+    # saves memory on large trees and makes the attribute reads in the
+    # collapse/support passes slot lookups instead of dict lookups.
+    __slots__ = (
+        'id', 'mutations', 'deletion', 'parent', 'children', 'depth', 'c_grad',
+        'support', 'cumulative_support', 'downstream_support', 'tot_cells',
+        'show_support', 'show_color'
+    )
+
     def __init__(self, id):
         self.id = id
         self.mutations = None
@@ -54,12 +63,10 @@ class Node:
     def get_s(self):
         # return int((self.downstream_support / (self.tot_cells - self.parent.cumulative_support))*100)
         # print(self.downstream_support, self.parent.downstream_support - self.parent.support)
-        try:
-            return int(
-                (self.downstream_support / (self.parent.downstream_support - self.parent.support)) * 100
-            )
-        except:
+        if self.parent is None:
             return 0
+        denom = self.parent.downstream_support - self.parent.support
+        return int(self.downstream_support * 100 / denom) if denom else 0
 
     def calc_cumulative_sup(self):
         if self.parent:
@@ -73,12 +80,15 @@ class Tree:
         self.root = root
         self.id_to_node = {}
         self.mut_to_node = {}
+        # Fast path for SASC output, where mutation names are small integers:
+        # a list indexed by the integer id avoids the string hash lookups.
+        self._mut_array = []
         self.deletions = []
         self.edges = []
         self.tree_label = None
 
         self.add_node(root)
-    
+
     def add_node(self, node):
         self.id_to_node[node.id] = node
 
@@ -86,17 +96,19 @@ class Tree:
         self.id_to_node.pop(node.id)
         for m in node.mutations:
             self.mut_to_node.pop(m)
-        
+            self._unindex_mut(m)
+
         node.parent.children.remove(node)
         for child in node.children:
             child.parent = node.parent
             node.parent.children.append(child)
-    
+
     def pop_node(self, node):
         self.id_to_node.pop(node.id)
         for m in node.mutations:
             self.mut_to_node.pop(m)
-            
+            self._unindex_mut(m)
+
         node.parent.children.remove(node)
         for child in node.children:
             child.parent = node.parent
@@ -110,14 +122,32 @@ class Tree:
         self.remove_node(to_merge)
         for m in merged.mutations:
             self.mut_to_node[m] = merged
-        
+            self._index_mut(m, merged)
+
         merged.support += to_merge.support
 
+    def _index_mut(self, mut, node):
+        if isinstance(mut, str) and mut.isdigit():
+            ix = int(mut)
+            if ix >= len(self._mut_array):
+                self._mut_array.extend([None] * (ix + 1 - len(self._mut_array)))
+            self._mut_array[ix] = node
+
+    def _unindex_mut(self, mut):
+        if isinstance(mut, str) and mut.isdigit():
+            ix = int(mut)
+            if ix < len(self._mut_array):
+                self._mut_array[ix] = None
+
+    def _lookup_mut(self, mut):
+        if isinstance(mut, str) and mut.isdigit():
+            ix = int(mut)
+            if ix < len(self._mut_array) and self._mut_array[ix] is not None:
+                return self._mut_array[ix]
+        return self.mut_to_node[mut]
+
     def get_node(self, id):
-        try:
-            return self.id_to_node[id]
-        except:
-            return None
+        return self.id_to_node.get(id)
 
     def add_edge(self, start_id, end_id):
         s_node = self.get_node(start_id)
@@ -129,18 +159,20 @@ class Tree:
         e_node.cumulative_support = s_node.cumulative_support
 
     def set_mutations(self, id, mutations):
-        self.get_node(id).mutations = mutations
-        for mut in mutations:
-            if not self.get_node(id).deletion:
-                self.mut_to_node[mut] = self.get_node(id)
+        node = self.get_node(id)
+        node.mutations = mutations
+        if not node.deletion:
+            for mut in mutations:
+                self.mut_to_node[mut] = node
+                self._index_mut(mut, node)
 
     def set_deletion(self, id):
         self.get_node(id).deletion = True
         self.deletions.append(self.get_node(id))
 
     def is_ancestor(self, anc_mut, node_mut):
-        anc = self.mut_to_node[anc_mut]
-        node = self.mut_to_node[node_mut]
+        anc = self._lookup_mut(anc_mut)
+        node = self._lookup_mut(node_mut)
         
         p = node.parent
         while p:
@@ -27,7 +27,13 @@ clustering.GenotypeMatrix.to_files('clustered.txt', mutations_file = 'clustered_
 from ._core.genotypematrix import GenotypeMatrix
 import numpy as np
 from kmodes.kmodes import KModes
-from collections import defaultdict
+
+# Numba is optional: when it is available the dissimilarity kernel is compiled
+# and parallelized across cores, otherwise the NumPy expression is used.
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
    
 def cluster_mutations(
         genotype_matrix,
@@ -71,8 +77,28 @@ def cluster_mutations(
     return _celluloid(genotype_matrix, k, n_inits, max_iter,verbose,**kwargs)
 
 def _conflict_dissim(a, b, **_):
-    v = np.vectorize(lambda ai, bi: ai != 2 and bi != 2 and ai != bi)
-    return np.sum(v(a, b), axis=1)
+    # Broadcasted ufuncs instead of an np.vectorize Python callback; this runs in
+    # KModes' innermost loop, so per-element Python dispatch dominates otherwise.
+    # kmodes sometimes passes object-dtype arrays (e.g. during initialization),
+    # which the compiled kernel cannot type.
+    if (njit is not None and a.ndim == 2 and b.ndim == 1
+            and np.issubdtype(a.dtype, np.number) and np.issubdtype(b.dtype, np.number)):
+        out = np.empty(a.shape[0], dtype=np.int64)
+        _conflict_dissim_kernel(a, b, out)
+        return out
+    return np.count_nonzero((a != 2) & (b != 2) & (a != b), axis=-1)
+
+
+if njit is not None:
+    @njit(cache=True, parallel=True, boundscheck=False)
+    def _conflict_dissim_kernel(centroids, point, out):
+        for i in prange(centroids.shape[0]):
+            conflicts = 0
+            for j in range(centroids.shape[1]):
+                ai = centroids[i, j]
+                bi = point[j]
+                conflicts += (ai != 2) & (bi != 2) & (ai != bi)
+            out[i] = conflicts
 
 
 def _celluloid(
@@ -108,9 +134,17 @@ def _celluloid(
             Cell labels are left unaltered.
     """
 
-    mutations_as_points = np.array(genotype_matrix.matrix(), dtype='int').transpose()
+    # int8 points: the dissimilarity sweep only does equality comparisons, and the
+    # narrow dtype moves 8x fewer bytes through KModes' inner loop.
+    mutations_as_points = np.ascontiguousarray(np.asarray(genotype_matrix.matrix(), dtype=np.int8).T)
     mutation_labels = genotype_matrix.mutation_labels
 
+    # The initializations are independent restarts, so they run in parallel
+    # across cores; kmodes dispatches them through joblib and keeps the
+    # lowest-cost run. Callers can still override this through kwargs.
+    if n_inits > 1:
+        kwargs.setdefault('n_jobs', -1)
+
     km = KModes(
         n_clusters=k,
         cat_dissim=_conflict_dissim,
@@ -123,22 +157,28 @@ def _celluloid(
 
     clusters = km.fit_predict(mutations_as_points)
 
-    # Each cluster will be labeled with the labels of its components.
-    clusters_of_mutations = km.labels_
-    clustered_mutation_labels = defaultdict(list)
-    for mutation_label, mutation_cluster in zip(mutation_labels, clusters_of_mutations):
-        clustered_mutation_labels[mutation_cluster].append(mutation_label)
-
-    nonempty_clusters = clustered_mutation_labels.keys()
-
-    # build the output matrix and the mutation labels as strings
+    # Each cluster will be labeled with the labels of its components. The
+    # grouping happens in C: a stable argsort brings the members of each
+    # cluster together and searchsorted finds the bucket boundaries, replacing
+    # one Python-level append per mutation.
+    clusters_of_mutations = np.asarray(km.labels_)
+    order = np.argsort(clusters_of_mutations, kind='stable')
+    sorted_labels = np.asarray(mutation_labels, dtype=object)[order]
+    sorted_clusters = clusters_of_mutations[order]
+    boundaries = np.searchsorted(sorted_clusters, np.arange(sorted_clusters[-1] + 2))
+
+    # build the output matrix and the mutation labels as strings; the buckets
+    # come out of the sort already ordered by cluster id.
     cluster_centroids = km.cluster_centroids_
-    clustered_mutation_labels_strings = [','.join(clustered_mutation_labels[cluster_id]) for cluster_id in
-                                         sorted(nonempty_clusters)]
-    out_matrix = [cluster_centroids[cluster_id] for cluster_id in sorted(nonempty_clusters)]
-
-    # the matrix needs to be transposed back to its original orientation
-    out_matrix = np.array(out_matrix).transpose()
+    nonempty_clusters = [cluster_id for cluster_id in range(len(boundaries) - 1)
+                         if boundaries[cluster_id + 1] > boundaries[cluster_id]]
+    clustered_mutation_labels_strings = [
+        ','.join(sorted_labels[boundaries[cluster_id]:boundaries[cluster_id + 1]])
+        for cluster_id in nonempty_clusters
+    ]
+    # Stacking along axis 1 builds the matrix directly in its original
+    # orientation, instead of materializing the transposed array and copying it.
+    out_matrix = np.stack([cluster_centroids[cluster_id] for cluster_id in nonempty_clusters], axis=1)
 
     return GenotypeMatrix(out_matrix, cell_labels=genotype_matrix.cell_labels,
                           mutation_labels=clustered_mutation_labels_strings)
@@ -1 +1 @@
-from ._phylogeny import inference
\ No newline at end of file
+from ._phylogeny import inference, inference_batch
\ No newline at end of file
@@ -1,9 +1,32 @@
 from ._sasc import sasc as _sasc
-from .._core.genotypematrix import GenotypeMatrix 
+from .._core.genotypematrix import GenotypeMatrix
+from concurrent.futures import ProcessPoolExecutor
+import os
 
 def inference(genotype_matrix, **kwargs):
 
     if not isinstance(genotype_matrix, GenotypeMatrix):
-        raise TypeError('genotype must be a valid GenotypeMatrix.')
+        raise TypeError('genotype_matrix must be a valid GenotypeMatrix.')
 
     return _sasc(genotype_matrix, **kwargs)
+
+def inference_batch(genotype_matrices, n_jobs=None, **kwargs):
+    """
+    Runs inference over a list of genotype matrices in parallel, one worker
+    process per matrix up to n_jobs (all cores by default). Processes are used
+    rather than threads because the underlying computation holds the GIL.
+    Returns the inferred trees in the same order as the input matrices.
+    """
+    genotype_matrices = list(genotype_matrices)
+    for genotype_matrix in genotype_matrices:
+        if not isinstance(genotype_matrix, GenotypeMatrix):
+            raise TypeError('genotype_matrix must be a valid GenotypeMatrix.')
+    if not genotype_matrices:
+        return []
+    if n_jobs is None:
+        n_jobs = os.cpu_count()
+
+    with ProcessPoolExecutor(max_workers=min(n_jobs, len(genotype_matrices))) as executor:
+        futures = [executor.submit(inference, genotype_matrix, **kwargs)
+                   for genotype_matrix in genotype_matrices]
+        return [future.result() for future in futures]
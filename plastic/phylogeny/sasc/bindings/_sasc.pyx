@@ -126,11 +126,16 @@ def sasc(
     cdef sca.sasc_in_t args_struct
     cdef sca.sasc_in_t* arguments = &args_struct
 
-    genotype_matrix = labeled_genotype_matrix.matrix()
+    # A typed memoryview over the (already int8, C-contiguous) matrix lets the
+    # marshalling loops below run at C speed instead of one Python indexing
+    # call per cell.
+    genotype_matrix = np.ascontiguousarray(labeled_genotype_matrix.matrix(), dtype=np.int8)
+    cdef const signed char[:, ::1] matrix_view = genotype_matrix
     arguments.N = genotype_matrix.shape[0]
     arguments.M = genotype_matrix.shape[1]
     cdef int N = arguments.N
     cdef int M = arguments.M
+    cdef Py_ssize_t i, j
 
     #input validation
     if beta < 0 or beta > 1:
@@ -192,7 +197,7 @@ def sasc(
         if arguments.genotype_matrix[i] == NULL:
             raise MemoryError()
         for j in range(M):
-            arguments.genotype_matrix[i][j] = genotype_matrix[i][j]
+            arguments.genotype_matrix[i][j] = matrix_view[i, j]
 
     # To work around the string size limitation for SASC, we pass their indexes in the lists in string form to SASC
     # instead of the labels.
@@ -243,6 +248,7 @@ def sasc(
 
     cdef int comp_result
     cdef sca.node_t* root
+    cdef signed char[:, ::1] expected_view
 
     try:
         # THE C A L L
@@ -281,11 +287,14 @@ def sasc(
                 best_tree.add_node(cell_id, shape = 'box')
                 best_tree.add_edge(str(c_out.ids_of_leaves[i]), cell_id)
     
-        # Unmarshalling the expected genotype matrix
-        expected_matrix = np.ndarray([N, M])
+        # Unmarshalling the expected genotype matrix; writing through a typed
+        # memoryview into an int8 array instead of per-cell Python assignments
+        # into a float ndarray.
+        expected_matrix = np.empty((N, M), dtype=np.int8)
+        expected_view = expected_matrix
         for i in range(N):
             for j in range(M):
-                expected_matrix[i][j] = c_out.gtp_matrix[i][j]
+                expected_view[i, j] = <signed char>c_out.gtp_matrix[i][j]
     
         # Unmarshalling the error learning parameters
         el_alphas = [None] * M
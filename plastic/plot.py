@@ -2,18 +2,42 @@
 from ._core.genotypematrix import GenotypeMatrix
 from ._core.phylogenytree import PhylogenyTree, SASCPhylogeny
 from matplotlib import pyplot as plt
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+# networkx is already a hard dependency of the core modules, so importing it
+# here adds nothing to import time.
+import networkx as nx
+
+# The optional heavyweight imports (sklearn, seaborn) stay out of module import
+# and are resolved once on first use instead of re-entering the import
+# machinery on every call.
+_PCA = None
+_sns = None
+
+def _lazy_pca():
+    global _PCA
+    if _PCA is None:
+        from sklearn.decomposition import PCA
+        _PCA = PCA
+    return _PCA
+
+def _lazy_sns():
+    global _sns
+    if _sns is None:
+        import seaborn
+        _sns = seaborn
+    return _sns
 
 def _build_colormap(unclustered, clustered):
-    mapping = dict()
-    for ix, l in enumerate(clustered):
-        for ll in l.split(','):
-            mapping[ll] = ix
-            
-    colors = list()
-    for l in unclustered:
-        colors.append(mapping[l])
-        
-    return colors
+    # One dict built from the flattened cluster labels, then a single C-level
+    # gather for the unclustered side instead of a Python append per label.
+    mapping = {
+        label: ix
+        for ix, cluster in enumerate(clustered)
+        for label in cluster.split(',')
+    }
+    return np.fromiter((mapping[label] for label in unclustered), dtype=np.int32, count=len(unclustered))
 
 def clusters(unclustered, clustered, ax=plt, **kwargs):
     if not isinstance(unclustered, GenotypeMatrix):
@@ -25,14 +49,36 @@ def clusters(unclustered, clustered, ax=plt, **kwargs):
             "clustered needs to be a valid GenotypeMatrix."
         )
 
-    from sklearn.decomposition import PCA
-
-    pca = PCA(n_components=2)
+    pca = _lazy_pca()(n_components=2)
     red = pca.fit_transform(unclustered.matrix().transpose())
 
     ax.scatter(x=red[:,0], y=red[:,1], c=_build_colormap(unclustered.mutation_labels, clustered.mutation_labels), **kwargs)
 
 
+# The support gradient never changes, so the 101 Color interpolations run once
+# on the first phylogeny() call; only the hex strings are kept, as an array so
+# the per-node colors come out of a single gather.
+_c_gradient_hex = None
+
+def _support_gradient_hex():
+    global _c_gradient_hex
+    if _c_gradient_hex is None:
+        from colour import Color
+        _c_gradient_hex = np.array(
+            [c.hex for c in Color("#3270FC").range_to(Color("#397D02"), 101)],
+            dtype=object
+        )
+    return _c_gradient_hex
+
+
+# Laying a tree out shells out to the dot binary, by far the most expensive
+# step of a re-render. PhylogenyTree instances are immutable, so the layout is
+# memoized per tree object; re-draws with different styling reuse it.
+@lru_cache(maxsize=32)
+def _graphviz_layout(tree):
+    return nx.nx_agraph.graphviz_layout(tree.as_digraph(), prog='dot')
+
+
 def _get_label_to_id_map(tree):
     return {
         node: '' if 'label' not in tree.nodes[node] else tree.nodes[node]['label']
@@ -41,26 +87,37 @@ def _get_label_to_id_map(tree):
 
 
 def phylogeny(tree, show_labels=False, show_support=False, graphviz_positioning=True, **kwargs):
-    import networkx as nx
-    from colour import Color
-
     if not isinstance(tree, PhylogenyTree):
         raise TypeError(
             "tree needs to be a valid PhylogenyTree."
         )
 
     t = tree.as_digraph()
-    
-    c_gradient = list(Color("#3270FC").range_to(Color("#397D02"), 101))
-
-    if show_labels:
-        kwargs['labels'] = _get_label_to_id_map(t)
-    
-    if show_support:
-        kwargs['node_color'] = [c_gradient[int(v)].hex for _, v in nx.get_node_attributes(t, 'support').items()]
 
+    # The dot subprocess and the label/color prep are independent, so the
+    # layout runs in a worker thread while the Python side gets ready; the
+    # wall time becomes max(dot, prep) instead of their sum.
+    layout_executor = None
     if graphviz_positioning:
-        kwargs['pos'] = nx.nx_agraph.graphviz_layout(t, prog="dot")
+        layout_executor = ThreadPoolExecutor(max_workers=1)
+        layout = layout_executor.submit(_graphviz_layout, tree)
+
+    try:
+        if show_labels:
+            kwargs['labels'] = _get_label_to_id_map(t)
+
+        if show_support:
+            supports = np.fromiter(
+                (int(v) for v in nx.get_node_attributes(t, 'support').values()),
+                dtype=np.int16
+            )
+            kwargs['node_color'] = _support_gradient_hex()[supports].tolist()
+
+        if layout_executor is not None:
+            kwargs['pos'] = layout.result()
+    finally:
+        if layout_executor is not None:
+            layout_executor.shutdown()
 
     nx.draw(
         t,
@@ -68,6 +125,4 @@ def phylogeny(tree, show_labels=False, show_support=False, graphviz_positioning=
     )
 
 def similarity_matrix(matrix, **kwargs):
-    import seaborn as sns
-
-    sns.heatmap(matrix, **kwargs)
\ No newline at end of file
+    _lazy_sns().heatmap(matrix, **kwargs)
\ No newline at end of file
@@ -90,8 +90,15 @@ def _mp3treesim(
     if int(cores) != cores:
         raise ValueError(f'the number of cores must be a positive integer, but {cores} is not.')
 
-    excluded1 = list(set(excluded1.split(',') + excluded_global.split(',')))
-    excluded2 = list(set(excluded2.split(',') + excluded_global.split(',')))
+    # In the common case nothing is excluded, so the split/union allocations are skipped.
+    if excluded1 or excluded_global:
+        excluded1 = list({*excluded1.split(','), *excluded_global.split(',')})
+    else:
+        excluded1 = []
+    if excluded2 or excluded_global:
+        excluded2 = list({*excluded2.split(','), *excluded_global.split(',')})
+    else:
+        excluded2 = []
 
     tree1_as_mp3 = mp3.build_tree(tree1.as_digraph(), ignore_unlabeled_nodes, excluded1)
     tree2_as_mp3 = mp3.build_tree(tree2.as_digraph(), ignore_unlabeled_nodes, excluded2)
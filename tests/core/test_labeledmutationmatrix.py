@@ -35,9 +35,12 @@ class Test_Immutability:
 
     def test_matrix_immutability_after_modification_to_accessor(self):
         a = stub_matrix()
-        a.matrix()[0][0] = 3
+        # the accessor shares a read-only array, so writes raise instead of
+        # silently going through to a throwaway copy
+        with pt.raises(ValueError):
+            a.matrix()[0][0] = 3
         b = stub_matrix()
-        assert np.all(a.matrix() == b.matrix())
+        assert np.array_equal(a.matrix(), b.matrix())
 
     def test_labels_immutability_after_modification_through_accessor(self):
         a = stub_matrix()
@@ -149,7 +152,7 @@ class Test_Serialization:
         d = a.to_serializable_dict()
         a_after_rt = GenotypeMatrix.from_serializable_dict(d)
 
-        assert np.all(a.matrix() == a_after_rt.matrix())
+        assert np.array_equal(a.matrix(), a_after_rt.matrix())
         assert a.cell_labels == a_after_rt.cell_labels
         assert a.mutation_labels == a_after_rt.mutation_labels
 
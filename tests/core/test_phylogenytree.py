@@ -2,7 +2,10 @@ from phylo._core.phylogenytree import *
 import networkx as nx
 import pytest as pt
 
-def dummy_graph():
+# The base graph is built once per module; each test gets an independent
+# constructor copy, which is much cheaper than re-adding the nodes and edges.
+@pt.fixture(scope='module')
+def _base_graph():
     G = nx.DiGraph()
     G.add_node('0', label = 'sabbia')
     G.add_node('1', label = 'pollo,boh')
@@ -11,14 +14,18 @@ def dummy_graph():
     G.add_edge('0', '2')
     return G
 
-def dummy_tree():
-    
-    return PhylogenyTree(dummy_graph())
+@pt.fixture
+def dummy_graph(_base_graph):
+    return nx.DiGraph(_base_graph)
+
+@pt.fixture
+def dummy_tree(dummy_graph):
+    return PhylogenyTree(dummy_graph)
 
 class TestInit:
 
-    def test_standard_init(self):
-        tree = dummy_tree()
+    def test_standard_init(self, dummy_tree):
+        tree = dummy_tree
 
     def test_init_with_nonstring_label_type(self):
         G = nx.DiGraph()
@@ -29,14 +36,14 @@ class TestInit:
     def test_init_with_empty_label(self):
         G = nx.DiGraph()
         G.add_node('0', label = '')
-        
+
         with pt.raises(ValueError):
             tree = PhylogenyTree(G)
 
-    def test_init_with_non_tree(self):
-        not_a_tree = dummy_graph()
+    def test_init_with_non_tree(self, dummy_graph):
+        not_a_tree = dummy_graph
         not_a_tree.add_edge('2', '0')
-        
+
         with pt.raises(NotATreeError):
             tree = PhylogenyTree(not_a_tree)
 
@@ -46,38 +53,38 @@ class TestInit:
         with pt.raises(TypeError):
             tree = PhylogenyTree(integer_node)
 
-    def test_init_with_bad_graph_attribute(self):
-        G = dummy_graph()
+    def test_init_with_bad_graph_attribute(self, dummy_graph):
+        G = dummy_graph
         G.graph['edge'] = 'this graph attribute is not allowed!'
         with pt.raises(ValueError):
             tree = PhylogenyTree(G)
 
 class TestAccessors:
 
-    def test_graph_accessor(self):
-        G = dummy_graph()
-        T = dummy_tree()
+    def test_graph_accessor(self, dummy_graph, dummy_tree):
+        G = dummy_graph
+        T = dummy_tree
         assert list(T.as_digraph().nodes(data = True)) == list(G.nodes(data = True))
         assert list(T.as_digraph().edges(data = True)) == list(G.edges(data = True))
 
 class TestImmutability:
 
-    def test_immutability_after_init(self):
-        G = dummy_graph()
+    def test_immutability_after_init(self, dummy_graph):
+        G = dummy_graph
         T = PhylogenyTree(G)
         G.add_edge('2', '0')
         assert ('2', '0') not in T.as_digraph().edges
 
-    def test_immutability_after_graph_access(self):
-        T = dummy_tree()
+    def test_immutability_after_graph_access(self, dummy_tree):
+        T = dummy_tree
         G = T.as_digraph()
         G.add_edge('2', '0')
         assert ('2', '0') not in T.as_digraph().edges
 
 class TestSerialization:
 
-    def test_serialization_roundtrip(self):
-        T = dummy_tree()
+    def test_serialization_roundtrip(self, dummy_tree):
+        T = dummy_tree
         T_as_string = T.to_dotstring()
         T_after_roundtrip = PhylogenyTree.from_dotstring(T_as_string)
 
@@ -87,12 +94,7 @@ class TestSerialization:
 
 class TestDrawing:
 
-    def test_rendering_to_png_and_pdf(self):
-        T = dummy_tree()
+    def test_rendering_to_png_and_pdf(self, dummy_tree):
+        T = dummy_tree
         T.draw_to_file('sabbia.png')
         T.draw_to_file('pollo.pdf')
-
-    
-        
-    
-        
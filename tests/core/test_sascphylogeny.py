@@ -41,4 +41,28 @@ class TestInit:
             a = SASCPhylogeny(a)
 
 
+class TestVisualizationFeatures:
+
+    # Regression test: a threshold that merges sibling mutation nodes used to
+    # crash the collapse with a KeyError on an already-removed node.
+    def test_with_support_threshold(self):
+        a = nx.DiGraph()
+        a.add_node('germline', label = 'germline')
+        for mutation in ('a', 'b', 'c', 'd'):
+            a.add_node(mutation, label = mutation)
+        a.add_edge('germline', 'a')
+        a.add_edge('a', 'b')
+        a.add_edge('a', 'c')
+        a.add_edge('c', 'd')
+        for index, parent in enumerate(['a'] * 4 + ['b', 'c', 'd']):
+            a.add_node(f'cell_{index}', shape = 'box')
+            a.add_edge(parent, f'cell_{index}')
+
+        viz = SASCPhylogeny(a).with_visualization_features(support_threshold = 60)
+
+        # b, c and d are all below the threshold, so they get merged into a.
+        labels = {attrs['label'] for _, attrs in viz.as_digraph().nodes(data = True)}
+        assert labels == {'germline', 'a,b,c,d'}
+
+
         
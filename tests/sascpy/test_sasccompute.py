@@ -10,7 +10,7 @@ def test_dummy_input(get_cells = False):
     
     out = infer_tree(
         labeled_genotype_matrix = with_str_labels,
-        alphas = [0.1] * len(with_str_labels.mutations()),
+        alphas = [0.1] * with_str_labels.n_mutations,
         beta = 0.00001,
         gammas = 0.2,
         el_a_variance = 0.01,
@@ -28,7 +28,7 @@ def test_dummy_input(get_cells = False):
 
     [print(node) for node in out['inferred_tree'].as_digraph().nodes(data = True)]
     [print(edge) for edge in out['inferred_tree'].as_digraph().edges]
-    [print(line) for line in out['expected_genotype_matrix'].matrix()]
+    [print(line) for line in out['expected_genotype_matrix'].iter_rows()]
     print(out['inferred_alphas'])
     print(out['inferred_beta'])
     print(out['inferred_gammas'])